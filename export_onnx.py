@@ -0,0 +1,34 @@
+"""
+Export both classifiers to INT8 ONNX ahead of deployment.
+
+Usage:
+    python export_onnx.py
+
+Writes fake_news.<fingerprint>.int8.onnx and satire.<fingerprint>.int8.onnx to
+ONNX_MODEL_DIR, which the server then loads at startup instead of exporting on
+its first start. The fingerprint covers the model revision and export settings,
+so re-run this after upgrading either.
+Requires onnxruntime and onnx.
+"""
+import logging
+
+from main import export_onnx_model, load_classifier, load_fast_tokenizer
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODELS = {
+    "fake_news": "mrm8488/bert-tiny-finetuned-fake-news-detection",
+    "satire": "helinivan/english-sarcasm-detector",
+}
+
+
+def main():
+    for name, model_name in MODELS.items():
+        tokenizer = load_fast_tokenizer(model_name)
+        model = load_classifier(model_name).eval()
+        export_onnx_model(model, tokenizer, name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+import os
+import re
+import logging
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+import xxhash
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Hashed bag-of-words feature space shared by training and inference
+N_FEATURES = 2 ** 20
+_TOKEN_RE = re.compile(r'(?u)\b\w\w+\b')
+
+# Coefficients exported by train_fast_model.py
+FAST_MODEL_PATH = os.getenv(
+    'FAST_MODEL_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fast_model.npz')
+)
+
+_weights = None
+_intercept = 0.0
+_load_attempted = False
+_load_lock = threading.Lock()
+
+
+def hash_features(text: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Map text to L2-normalized hashed term counts.
+    
+    Returns the sorted feature indices and their values, i.e. one sparse row.
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    
+    hashes = np.fromiter(
+        (xxhash.xxh3_64_intdigest(token.encode()) for token in tokens),
+        dtype=np.uint64,
+        count=len(tokens)
+    )
+    indices, counts = np.unique((hashes % N_FEATURES).astype(np.int64), return_counts=True)
+    values = (counts / np.sqrt(np.dot(counts, counts))).astype(np.float32)
+    
+    return indices, values
+
+
+def load_fast_model() -> bool:
+    """Load the exported linear model once; returns whether it is available."""
+    global _weights, _intercept, _load_attempted
+    
+    if _load_attempted:
+        return _weights is not None
+    
+    with _load_lock:
+        if not _load_attempted:
+            try:
+                exported = np.load(FAST_MODEL_PATH)
+                _weights = exported['coef'].astype(np.float32).ravel()
+                _intercept = float(exported['intercept'])
+                logger.info("Loaded fast model from %s", FAST_MODEL_PATH)
+            except FileNotFoundError:
+                logger.info("No fast model at %s, fast mode will use the transformer", FAST_MODEL_PATH)
+            except Exception as e:
+                logger.error("Error loading fast model: %s", e)
+            _load_attempted = True
+    
+    return _weights is not None
+
+
+def fast_fake_news_score(text: str) -> Optional[float]:
+    """Probability that text is fake news under the linear model, or None if it isn't available."""
+    if not load_fast_model():
+        return None
+    
+    indices, values = hash_features(text)
+    logit = float(np.dot(_weights[indices], values)) + _intercept
+    
+    return float(1.0 / (1.0 + np.exp(-logit)))
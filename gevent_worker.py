@@ -0,0 +1,24 @@
+"""
+gunicorn gevent worker used by gunicorn.conf.py.
+
+gunicorn's own gevent worker calls monkey.patch_all() with its aggressive
+default, which deletes select.epoll. huggingface_hub imports httpcore, whose
+optional trio backend needs select.epoll at import time, so with trio
+installed the worker fails to import the models and never boots. This worker
+patches the same modules but leaves epoll in place.
+"""
+from gevent import monkey, socket
+from gunicorn.workers.ggevent import GeventWorker
+
+
+class Worker(GeventWorker):
+    """GeventWorker that monkey-patches without removing select.epoll."""
+    
+    def patch(self):
+        monkey.patch_all(aggressive=False)
+        
+        # Rewrap the listening sockets as gevent sockets, as GeventWorker.patch does
+        self.sockets = [
+            socket.socket(s.FAMILY, socket.SOCK_STREAM, fileno=s.sock.detach())
+            for s in self.sockets
+        ]
@@ -0,0 +1,30 @@
+import os
+
+from dotenv import load_dotenv
+
+# GUNICORN_WORKERS and INFERENCE_THREADS may come from .env, like the app's settings
+load_dotenv()
+
+# Serve the Flask app through the gevent-patched entrypoint
+wsgi_app = "wsgi:app"
+bind = os.getenv("BIND", "0.0.0.0:8001")
+
+# Handlers mostly wait on article fetches and the MediaCloud API; gevent lets
+# one worker keep many of those in flight. Each worker loads its own copy of
+# both models, so lower GUNICORN_WORKERS on memory-constrained hosts.
+# gevent_worker.Worker is gunicorn's gevent worker minus the aggressive select
+# patching that breaks importing huggingface_hub when trio is installed.
+worker_class = "gevent_worker.Worker"
+worker_connections = 1000
+workers = int(os.getenv("GUNICORN_WORKERS", 2 * (os.cpu_count() or 1) + 1))
+
+# Workers load and warm both models on a native thread as soon as they import
+# server.py. Split the CPUs between them so concurrent forwards in different
+# workers don't oversubscribe the cores; INFERENCE_THREADS still overrides.
+#
+# Run `python export_onnx.py` before deploying: otherwise every worker exports
+# and quantizes both models itself on first boot, on its share of the CPUs.
+os.environ.setdefault("INFERENCE_THREADS", str(max(1, (os.cpu_count() or 1) // workers)))
+
+# Long articles and slow news sites can take a while to fetch and score
+timeout = 60
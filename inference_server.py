@@ -0,0 +1,99 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List
+
+try:
+    from gevent import get_hub
+    from gevent.monkey import is_module_patched
+except ImportError:  # gevent is only used by the gunicorn entrypoint
+    get_hub = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Stop collecting once this many chunks are waiting, or after this long
+MAX_BATCH = 32
+MAX_WAIT_MS = 8
+
+
+def run_blocking(fn: Callable[..., Any], *args) -> Any:
+    """
+    Call fn on a native OS thread when gevent has patched threading.
+    
+    Under gunicorn's gevent workers every threading.Thread is a greenlet on the
+    event loop's thread, so model loading and forwards would stall all other
+    requests (and the worker's heartbeat) while they run. gevent's thread pool
+    runs fn on a real thread and only the calling greenlet waits for it.
+    """
+    if get_hub is not None and is_module_patched('threading'):
+        return get_hub().threadpool.apply(fn, args)
+    return fn(*args)
+
+
+class MicroBatcher:
+    """
+    Combines scoring calls from concurrent requests into shared forward passes.
+    
+    Callers submit their chunks and get a Future; a background thread takes
+    the first waiting submission, keeps collecting for up to MAX_WAIT_MS or
+    until MAX_BATCH chunks are queued, scores everything in one call to
+    score_fn and hands each caller back its own slice of the scores.
+    """
+    
+    def __init__(self, score_fn: Callable[[List], List[float]], name: str,
+                 max_batch: int = MAX_BATCH, max_wait_ms: float = MAX_WAIT_MS):
+        self.score_fn = score_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        
+        threading.Thread(target=self._run, name=f"batcher-{name}", daemon=True).start()
+    
+    def submit(self, chunks: List) -> "Future[List[float]]":
+        """Queue chunks for scoring; the future resolves to one score per chunk."""
+        future: "Future[List[float]]" = Future()
+        if not chunks:
+            future.set_result([])
+        else:
+            self._queue.put((chunks, future))
+        return future
+    
+    def _collect(self) -> List[tuple]:
+        """Block for the first submission, then gather more until the batch is full or the wait runs out."""
+        batch = [self._queue.get()]
+        pending_chunks = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+        
+        while pending_chunks < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            pending_chunks += len(item[0])
+        
+        return batch
+    
+    def _run(self):
+        while True:
+            batch = self._collect()
+            
+            try:
+                scores = run_blocking(self.score_fn, [chunk for chunks, _ in batch for chunk in chunks])
+            except Exception as e:
+                logger.error("Batched scoring failed: %s", e)
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            
+            start = 0
+            for chunks, future in batch:
+                future.set_result(scores[start:start + len(chunks)])
+                start += len(chunks)
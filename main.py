@@ -1,11 +1,40 @@
+import os
+
+# Let the Rust tokenizers backend use all cores for batched encoding
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+
+import numpy as np
 import torch
 import requests
-from bs4 import BeautifulSoup
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-from urllib.parse import urlparse
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import xxhash
+from transformers import AutoTokenizer, AutoModelForSequenceClassification, PreTrainedTokenizerFast
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import codecs
+import inspect
+import json
 import logging
-from typing import Optional, Dict, Any
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+import time
+from typing import Optional, Dict, Any, List, Tuple
+from fast_model import fast_fake_news_score
+from inference_server import MicroBatcher, run_blocking
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax is preferred; BeautifulSoup + lxml is the fallback
+    LexborHTMLParser = None
+    from bs4 import BeautifulSoup
+
+try:
+    import onnxruntime as ort
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+except ImportError:  # ONNX Runtime is optional; CPU inference falls back to TorchScript
+    ort = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,6 +52,7 @@ PLANETS = [
     "♅ Uranus",
     "☆ Neptune"
 ]
+_PLANETS_ARR = np.array(PLANETS, dtype=object)
 
 # Global variables for model and tokenizer (singleton pattern)
 _tokenizer = None
@@ -30,33 +60,508 @@ _model = None
 _satire_tokenizer = None
 _satire_model = None
 _device = None
+_fake_news_stream = None
+_satire_stream = None
+_models_lock = threading.Lock()
+_models_ready = threading.Event()
+_onnx_export_lock = threading.Lock()
+
+# Each model scores the chunks of all concurrent requests together, on its own
+# thread and CUDA stream, so the two models still run side by side
+_fake_news_batcher = MicroBatcher(
+    lambda chunks: run_on_stream(_fake_news_stream, batched_token_scores, _model, _tokenizer, chunks),
+    name="fake-news"
+)
+_satire_batcher = MicroBatcher(
+    lambda chunks: run_on_stream(_satire_stream, batched_token_scores, _satire_model, _satire_tokenizer, chunks),
+    name="satire"
+)
+
+# URL detection: a cheap prefix check for routing, a regex requiring a host for fetching
+URL_PREFIXES = ('http://', 'https://')
+_URL_RE = re.compile(r'^https?://[^/?#\s]+')
+
+# Query parameters that only track the visitor and never change the article
+_TRACKING_PARAM_RE = re.compile(r'^(utm_\w+|fbclid|gclid|dclid|msclkid|mc_cid|mc_eid|igshid|ref_src)$', re.IGNORECASE)
+
+# Sentence boundaries and spam phrases used when cleaning extracted text
+_SENT_SPLIT = re.compile(r'[.!?]+')
+_SPAM_RE = re.compile(r'subscribe|newsletter|click here|sign up|follow us|copyright|all rights reserved')
+
+# Opening tag of the main article container, and the closing tag to stop reading at
+_CONTAINER_OPEN_RE = re.compile(rb'<(article|main)[\s>]', re.IGNORECASE)
+
+# Charset declared in a Content-Type header, or in a page's <meta charset> / http-equiv tag
+_HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+# Opening or closing tag of a container, group 1 is "/" for closing tags
+_CONTAINER_TAG_RES = {
+    b'article': re.compile(rb'<(/?)article[\s>]', re.IGNORECASE),
+    b'main': re.compile(rb'<(/?)main[\s>]', re.IGNORECASE)
+}
+
+# Elements that never contain article text
+NOISE_TAGS_SELECTOR = "script, style, nav, header, footer, aside, iframe, noscript, form, button"
+
+# Ad/tracking containers, matched by case-insensitive substring on class or id
+NOISE_CONTAINER_KEYWORDS = [
+    'ad', 'advertisement', 'social', 'share', 'comment', 'related', 'sidebar', 'menu',
+    'promo', 'newsletter', 'subscription', 'popup', 'trending', 'recommended', 'widget', 'banner'
+]
+NOISE_CONTAINERS_SELECTOR = ", ".join(
+    f"{tag}[{attr}*={keyword} i]"
+    for tag in ['div', 'section', 'span']
+    for attr in ['class', 'id']
+    for keyword in NOISE_CONTAINER_KEYWORDS
+)
+
+# Shared HTTP session so article fetches reuse keep-alive connections; the pool
+# is sized for concurrent fetches and transient connection/gateway errors are retried
+_http = requests.Session()
+_http.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+})
+_http_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504), allowed_methods=("GET",))
+)
+_http.mount('http://', _http_adapter)
+_http.mount('https://', _http_adapter)
+
+# Quantized kernel backends in order of preference: x86 dispatches between
+# fbgemm and oneDNN (VNNI), qnnpack covers ARM
+QUANTIZED_ENGINES = ("x86", "fbgemm", "onednn", "qnnpack")
+
+# Where exported ONNX classifiers are kept between restarts
+ONNX_MODEL_DIR = os.getenv(
+    'ONNX_MODEL_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'onnx_models')
+)
+
+# Recent torch defaults to the dynamo exporter; keep the TorchScript one. The
+# dynamo keyword only exists from torch 2.5, so it's passed only where accepted
+ONNX_EXPORT_OPTIONS = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+ONNX_OPSET = 17
+
+# CPU threads per inference call; lower this when running several gunicorn workers
+INFERENCE_THREADS = int(os.getenv('INFERENCE_THREADS', os.cpu_count() or 1))
+
+# Token-length buckets for batching chunks with similar padding
+SEQUENCE_BUCKETS = (64, 128, 256, 512)
+
+# Largest batch sent through a model at once when many articles are scored together
+MAX_BATCH_SIZE = 64
+
+# Inputs shorter than this get a neutral score without running the models
+MIN_TEXT_LENGTH = 40
 
-# Cache with TTL
-_cache = {}
+# Fast mode trusts the linear model only this far from the 0.5 decision boundary
+FAST_MODE_MARGIN = 0.15
+
+# Divs whose class suggests they hold the article body, matched in document order
+CONTENT_DIVS_SELECTOR = ", ".join(
+    f"div[class*={keyword} i]" for keyword in ['content', 'article', 'post', 'body', 'story']
+)
+
+# Everything strip_noise removes, matched in a single pass over the page
+NOISE_SELECTOR = f"{NOISE_TAGS_SELECTOR}, {NOISE_CONTAINERS_SELECTOR}"
+
+# Everything find_article_text may take the body from, matched in a single pass
+ARTICLE_CANDIDATES_SELECTOR = f"article, main, {CONTENT_DIVS_SELECTOR}, p"
+
+# LRU cache with TTL
+_cache: "OrderedDict[str, Tuple[Dict, float]]" = OrderedDict()
+_cache_lock = threading.Lock()
 CACHE_TTL_SECONDS = 3600
+CACHE_MAX_ENTRIES = 4096
+
+# LRU of per-chunk model scores, so windows shared between articles are scored once
+_chunk_scores: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+_chunk_scores_lock = threading.Lock()
+CHUNK_SCORES_MAX_ENTRIES = 16384
+
+
+def load_fast_tokenizer(model_name: str):
+    """Load the Rust-backed tokenizer for a model, warning if only the Python one exists."""
+    tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+    if not isinstance(tokenizer, PreTrainedTokenizerFast):
+        logger.warning("No fast tokenizer available for %s, tokenization will be slower", model_name)
+    return tokenizer
+
+
+def load_classifier(model_name: str):
+    """Load a sequence classifier, preferring PyTorch's fused scaled-dot-product attention."""
+    try:
+        return AutoModelForSequenceClassification.from_pretrained(model_name, attn_implementation="sdpa")
+    except (ValueError, TypeError) as e:
+        logger.warning("SDPA attention unavailable for %s, using default attention: %s", model_name, e)
+        return AutoModelForSequenceClassification.from_pretrained(model_name)
+
+
+def same_tokenization(tokenizer, other) -> bool:
+    """Whether two tokenizers produce identical token ids for any text."""
+    if tokenizer is None or other is None:
+        return False
+    
+    backend = getattr(tokenizer, "backend_tokenizer", None)
+    other_backend = getattr(other, "backend_tokenizer", None)
+    if backend is None or other_backend is None:
+        return type(tokenizer) is type(other) and tokenizer.get_vocab() == other.get_vocab()
+    
+    # Truncation and padding are per-call settings, not part of the tokenization
+    configs = [json.loads(b.to_str()) for b in (backend, other_backend)]
+    for config in configs:
+        config.pop("truncation", None)
+        config.pop("padding", None)
+    return configs[0] == configs[1]
+
+
+def optimize_model(model):
+    """
+    Shrink a loaded classifier for faster inference on the current device.
+    
+    On CPU the Linear layers are dynamically quantized to INT8 so they run on
+    the fbgemm/oneDNN int8 GEMM kernels; on GPU the weights are cast to BF16
+    where supported (same tensor-core speed as FP16 without its overflow
+    risk) and FP16 otherwise.
+    """
+    if _device == "cuda":
+        if torch.cuda.is_bf16_supported():
+            return model.to(torch.bfloat16)
+        return model.half()
+    
+    try:
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    except Exception as e:
+        logger.warning("Dynamic quantization unavailable, using FP32 model: %s", e)
+        return model
+
+
+def compile_model(model, tokenizer):
+    """
+    Trace and freeze a classifier into TorchScript for the hot forward pass.
+    
+    The traced graph skips the eager transformers Python dispatch and lets the
+    JIT fuse the bias-add/GELU/LayerNorm chains. Falls back to the eager model
+    if tracing is not supported for it.
+    """
+    example = tokenizer(
+        "warm up text",
+        return_tensors="pt",
+        padding="max_length",
+        max_length=512,
+        truncation=True
+    )
+    example_inputs = (example["input_ids"].to(_device), example["attention_mask"].to(_device))
+    
+    try:
+        with torch.no_grad():
+            traced = torch.jit.trace(model, example_inputs, strict=False)
+            traced = torch.jit.freeze(traced.eval())
+    except Exception as e:
+        logger.warning("TorchScript compilation failed, using eager model: %s", e)
+        return model
+    
+    # Some backends can't apply every inference rewrite; the frozen trace still helps
+    try:
+        return torch.jit.optimize_for_inference(traced)
+    except Exception as e:
+        logger.warning("optimize_for_inference failed, using frozen TorchScript model: %s", e)
+        return traced
+
+
+def model_logits(model, inputs: Dict[str, torch.Tensor]) -> torch.Tensor:
+    """Run a (possibly TorchScript-compiled) classifier and return its logits."""
+    outputs = model(inputs["input_ids"], inputs["attention_mask"])
+    if isinstance(outputs, dict):
+        return outputs["logits"]
+    return outputs[0]
+
+
+class CudaGraphRunner:
+    """
+    Replays captured CUDA graphs of a classifier forward pass.
+    
+    Graphs are captured once per (batch size, SEQUENCE_BUCKETS length) on
+    static buffers; inputs are copied into the smallest buffer that fits and
+    the graph is replayed, removing the per-kernel launch overhead while short
+    batches still only pay for their bucket's length. CPU inputs are staged
+    through preallocated pinned host buffers so the upload is a single async
+    copy. Inputs that don't fit any captured shape fall through to the wrapped
+    model.
+    """
+    
+    def __init__(self, model, batch_sizes=(1, 4, 8), lengths=SEQUENCE_BUCKETS):
+        self.model = model
+        self.graphs = {}
+        self._lock = threading.Lock()
+        
+        for batch_size in batch_sizes:
+            for length in lengths:
+                self.graphs[(batch_size, length)] = self._capture(batch_size, length)
+    
+    def _capture(self, batch_size: int, length: int):
+        """Warm up and capture one forward pass on static (batch_size, length) buffers."""
+        static_inputs = {
+            'input_ids': torch.zeros((batch_size, length), dtype=torch.long, device="cuda"),
+            'attention_mask': torch.ones((batch_size, length), dtype=torch.long, device="cuda")
+        }
+        host_inputs = {
+            name: torch.zeros((batch_size, length), dtype=torch.long, pin_memory=True)
+            for name in static_inputs
+        }
+        
+        # Warm up on a side stream before capture, as required by CUDA graphs
+        stream = torch.cuda.Stream()
+        stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(stream), torch.no_grad():
+            for _ in range(3):
+                model_logits(self.model, static_inputs)
+        torch.cuda.current_stream().wait_stream(stream)
+        
+        graph = torch.cuda.CUDAGraph()
+        with torch.no_grad(), torch.cuda.graph(graph):
+            static_logits = model_logits(self.model, static_inputs)
+        
+        return graph, static_inputs, host_inputs, static_logits, torch.cuda.Event()
+    
+    def __call__(self, input_ids: torch.Tensor, attention_mask: torch.Tensor):
+        batch_size, seq_len = input_ids.shape
+        captured = min(
+            (shape for shape in self.graphs if shape[0] >= batch_size and shape[1] >= seq_len),
+            key=lambda shape: shape[0] * shape[1],
+            default=None
+        )
+        
+        if captured is None:
+            return self.model(input_ids.to("cuda"), attention_mask.to("cuda"))
+        
+        graph, static_inputs, host_inputs, static_logits, upload_done = self.graphs[captured]
+        from_host = input_ids.device.type == "cpu"
+        
+        with self._lock:
+            # The previous async upload must finish reading the pinned buffers
+            upload_done.synchronize()
+            
+            staging = host_inputs if from_host else static_inputs
+            for name, tensor in (('input_ids', input_ids), ('attention_mask', attention_mask)):
+                staging[name].zero_()
+                staging[name][:batch_size, :seq_len].copy_(tensor)
+                if from_host:
+                    static_inputs[name].copy_(staging[name], non_blocking=True)
+            upload_done.record()
+            
+            graph.replay()
+            return (static_logits[:batch_size].clone(),)
+
+
+def onnx_model_path(model, name: str) -> str:
+    """
+    Where the INT8 ONNX export of a classifier lives.
+    
+    The file name carries a fingerprint of the model id and revision, the
+    export and quantization settings and the torch version, so an export left
+    over from a different model or exporter is never loaded in its place.
+    """
+    config = model.config
+    fingerprint = xxhash.xxh3_64_hexdigest(json.dumps([
+        config.name_or_path,
+        getattr(config, "_commit_hash", None),
+        ONNX_OPSET,
+        str(QuantType.QInt8),
+        sorted(ONNX_EXPORT_OPTIONS.items()),
+        torch.__version__
+    ]).encode())
+    return os.path.join(ONNX_MODEL_DIR, f"{name}.{fingerprint}.int8.onnx")
+
+
+def export_onnx_model(model, tokenizer, name: str) -> str:
+    """
+    Export a classifier to ONNX with its MatMuls dynamically quantized to INT8.
+    
+    Files are written under temporary names and moved into place, so a
+    concurrent export or a crash mid-way never leaves a truncated model behind.
+    Returns the path of the quantized model.
+    """
+    os.makedirs(ONNX_MODEL_DIR, exist_ok=True)
+    model_path = onnx_model_path(model, name)
+    fp32_path = os.path.join(ONNX_MODEL_DIR, f"{name}.{os.getpid()}.onnx")
+    int8_path = os.path.join(ONNX_MODEL_DIR, f"{name}.{os.getpid()}.int8.onnx")
+    example = tokenizer("warm up text", return_tensors="pt")
+    
+    # The TorchScript-based exporter keeps global state, so only one export runs at a time
+    with _onnx_export_lock:
+        try:
+            with torch.no_grad():
+                torch.onnx.export(
+                    model,
+                    (example["input_ids"], example["attention_mask"]),
+                    fp32_path,
+                    input_names=["input_ids", "attention_mask"],
+                    output_names=["logits"],
+                    dynamic_axes={
+                        "input_ids": {0: "batch", 1: "sequence"},
+                        "attention_mask": {0: "batch", 1: "sequence"},
+                        "logits": {0: "batch"}
+                    },
+                    opset_version=ONNX_OPSET,
+                    **ONNX_EXPORT_OPTIONS
+                )
+            quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+            os.replace(int8_path, model_path)
+        finally:
+            for path in (fp32_path, int8_path):
+                if os.path.exists(path):
+                    os.remove(path)
+    
+    logger.info("Exported %s to %s", name, model_path)
+    return model_path
+
+
+class OnnxRunner:
+    """
+    Runs an exported classifier through ONNX Runtime on CPU.
+    
+    The INT8 model is exported to ONNX_MODEL_DIR on first start unless
+    export_onnx.py already produced it; the session applies all graph
+    optimizations, fusing attention, LayerNorm and GELU, which removes most of
+    the per-op dispatch cost that dominates a model as small as bert-tiny.
+    """
+    
+    def __init__(self, model, tokenizer, name: str):
+        model_path = onnx_model_path(model, name)
+        if not os.path.exists(model_path):
+            export_onnx_model(model, tokenizer, name)
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = INFERENCE_THREADS
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+    
+    def __call__(self, input_ids: torch.Tensor, attention_mask: torch.Tensor):
+        logits = self.session.run(
+            ["logits"],
+            {"input_ids": input_ids.numpy(), "attention_mask": attention_mask.numpy()}
+        )[0]
+        return (torch.from_numpy(logits),)
+
+
+def prepare_model(model, tokenizer, name: str):
+    """
+    Put a loaded classifier into its fastest available form for the current device.
+    
+    On CPU that is ONNX Runtime when installed; otherwise the model is
+    quantized or cast, compiled to TorchScript and, on GPU, graph-captured.
+    """
+    model.to(_device).eval()
+    
+    if _device == "cpu" and ort is not None:
+        try:
+            return OnnxRunner(model, tokenizer, name)
+        except Exception as e:
+            logger.warning("ONNX Runtime export failed for %s, using TorchScript: %s", name, e)
+    
+    model = optimize_model(model)
+    model = compile_model(model, tokenizer)
+    return capture_cuda_graphs(model)
+
+
+def to_model_device(model, inputs: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+    """Move tokenized inputs to the model's device, unless a CudaGraphRunner stages them itself."""
+    if isinstance(model, CudaGraphRunner):
+        return inputs
+    return {k: v.to(_device, non_blocking=True) for k, v in inputs.items()}
+
+
+def capture_cuda_graphs(model):
+    """Wrap a classifier in a CudaGraphRunner when running on GPU."""
+    if _device != "cuda":
+        return model
+    
+    try:
+        return CudaGraphRunner(model)
+    except Exception as e:
+        logger.warning("CUDA graph capture failed, using uncaptured model: %s", e)
+        return model
 
 
 def initialize_model():
     """Lazy load and initialize the models once using singleton pattern."""
+    if _models_ready.is_set():
+        return
+    
+    with _models_lock:
+        if not _models_ready.is_set():
+            run_blocking(_load_models)
+            run_blocking(warm_up_models)
+            _models_ready.set()
+
+
+def _load_models():
+    """Load, optimize and compile both classifiers."""
     global _tokenizer, _model, _satire_tokenizer, _satire_model, _device
+    global _fake_news_stream, _satire_stream
     
     if _model is None:
         _device = "cuda" if torch.cuda.is_available() else "cpu"
         
-        _tokenizer = AutoTokenizer.from_pretrained("mrm8488/bert-tiny-finetuned-fake-news-detection")
-        _model = AutoModelForSequenceClassification.from_pretrained("mrm8488/bert-tiny-finetuned-fake-news-detection")
-        _model.to(_device)
+        if _device == "cuda":
+            _fake_news_stream = torch.cuda.Stream()
+            _satire_stream = torch.cuda.Stream()
+        
+        if _device == "cpu":
+            torch.set_num_threads(INFERENCE_THREADS)
+            # Pick the best int8 GEMM backend for the dynamically quantized Linear layers
+            for engine in QUANTIZED_ENGINES:
+                if engine in torch.backends.quantized.supported_engines:
+                    torch.backends.quantized.engine = engine
+                    break
+        
+        _tokenizer = load_fast_tokenizer("mrm8488/bert-tiny-finetuned-fake-news-detection")
+        _model = load_classifier("mrm8488/bert-tiny-finetuned-fake-news-detection")
+        _model = prepare_model(_model, _tokenizer, "fake_news")
     
     if _satire_model is None:
         try:
-            _satire_tokenizer = AutoTokenizer.from_pretrained("helinivan/english-sarcasm-detector")
-            _satire_model = AutoModelForSequenceClassification.from_pretrained("helinivan/english-sarcasm-detector")
-            _satire_model.to(_device)
+            _satire_tokenizer = load_fast_tokenizer("helinivan/english-sarcasm-detector")
+            if same_tokenization(_satire_tokenizer, _tokenizer):
+                # Both are BERT uncased WordPiece; tokenize each article once for both models
+                _satire_tokenizer = _tokenizer
+            _satire_model = load_classifier("helinivan/english-sarcasm-detector")
+            _satire_model = prepare_model(_satire_model, _satire_tokenizer, "satire")
         except Exception:
             _satire_model = None
             _satire_tokenizer = None
 
 
+def warm_up_models():
+    """
+    Run max-length dummy forwards through both classifiers.
+    
+    The frozen TorchScript graphs specialize on their first calls, so doing it
+    here keeps that cost off the first real request.
+    """
+    models = [(_model, _tokenizer), (_satire_model, _satire_tokenizer)]
+    
+    for model, tokenizer in models:
+        if model is None or tokenizer is None:
+            continue
+        
+        inputs = tokenizer(
+            "warm up text",
+            return_tensors="pt",
+            padding="max_length",
+            max_length=512,
+            truncation=True
+        )
+        inputs = to_model_device(model, inputs)
+        
+        with torch.inference_mode():
+            for _ in range(2):
+                model_logits(model, inputs)
+
+
 def clean_extracted_text(text: str) -> str:
     """
     Clean up extracted text by removing common noise.
@@ -64,16 +569,10 @@ def clean_extracted_text(text: str) -> str:
     This function filters out UI elements, navigation, and spam content
     while preserving the actual article text.
     """
-    import re
-    
     # Split into sentences for granular filtering
-    sentences = re.split(r'[.!?]+', text)
+    sentences = _SENT_SPLIT.split(text)
     cleaned_sentences = []
     
-    # Spam keywords to check for (but don't auto-remove entire sentences)
-    spam_keywords = ['subscribe', 'newsletter', 'click here', 'sign up', 
-                     'follow us', 'copyright', 'all rights reserved']
-    
     for sentence in sentences:
         sentence = sentence.strip()
         
@@ -83,7 +582,8 @@ def clean_extracted_text(text: str) -> str:
             
         # Skip sentences that are mostly spam
         sentence_lower = sentence.lower()
-        spam_word_count = sum(1 for keyword in spam_keywords if keyword in sentence_lower)
+        # Count distinct spam keywords present (but don't auto-remove entire sentences)
+        spam_word_count = len(set(_SPAM_RE.findall(sentence_lower)))
         word_count = len(sentence.split())
         
         # Only skip if >30% of sentence is spam keywords (preserves sentences with occasional spam words)
@@ -93,62 +593,185 @@ def clean_extracted_text(text: str) -> str:
     return '. '.join(cleaned_sentences)
 
 
+def read_article_html(response) -> Tuple[bytes, bool]:
+    """
+    Read a streamed response until the first <article>/<main> element closes.
+    
+    Nested elements of the same tag (e.g. embedded <article> cards) are
+    counted so reading only stops at the outer element's closing tag.
+    Returns the bytes read and whether the body was read to the end, so the
+    rest of a long page is never downloaded once the article is complete.
+    """
+    buffer = bytearray()
+    tag_re = None
+    depth = 0
+    search_from = 0
+    
+    for block in response.iter_content(chunk_size=16384):
+        buffer += block
+        
+        if tag_re is None:
+            opening = _CONTAINER_OPEN_RE.search(buffer, search_from)
+            if opening is None:
+                # Only rescan the tail that could hold a tag split across blocks
+                search_from = max(0, len(buffer) - 16)
+                continue
+            tag_re = _CONTAINER_TAG_RES[opening.group(1).lower()]
+            depth = 1
+            search_from = opening.end()
+        
+        for match in tag_re.finditer(buffer, search_from):
+            depth += -1 if match.group(1) else 1
+            search_from = match.end()
+            if depth == 0:
+                return bytes(buffer), False
+        # Only rescan the tail that could hold a tag split across blocks
+        search_from = max(search_from, len(buffer) - 16)
+    
+    return bytes(buffer), True
+
+
+class SoupNode:
+    """selectolax-style view of a BeautifulSoup tag."""
+    
+    def __init__(self, tag):
+        self._tag = tag
+    
+    @property
+    def tag(self) -> str:
+        return self._tag.name
+    
+    def text(self, separator: str = '') -> str:
+        return self._tag.get_text(separator=separator)
+    
+    def decompose(self):
+        self._tag.decompose()
+
+
+class SoupTree:
+    """selectolax-style wrapper around BeautifulSoup, used when selectolax isn't installed."""
+    
+    def __init__(self, html: str):
+        self.soup = BeautifulSoup(html, 'lxml')
+    
+    def css(self, selector: str) -> List[SoupNode]:
+        return [SoupNode(tag) for tag in self.soup.select(selector)]
+
+
+def html_encoding(response, html: bytes) -> str:
+    """
+    Charset to decode a page with.
+    
+    The Content-Type header wins, then the page's <meta> declaration; pages
+    declaring neither are UTF-8 if their bytes decode as it, else windows-1252.
+    Like browsers, a declared ISO-8859-1 is read as its windows-1252 superset.
+    """
+    declared = [
+        _HEADER_CHARSET_RE.search(response.headers.get('Content-Type', '')),
+        _META_CHARSET_RE.search(html, 0, 4096)
+    ]
+    
+    for match in declared:
+        if match is None:
+            continue
+        name = match.group(1)
+        try:
+            encoding = codecs.lookup(name.decode('ascii') if isinstance(name, bytes) else name).name
+        except (LookupError, UnicodeDecodeError):
+            continue
+        return 'cp1252' if encoding == 'latin-1' else encoding
+    
+    try:
+        # final=False tolerates a character cut off where the streamed read stopped
+        codecs.getincrementaldecoder('utf-8')().decode(html, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp1252'
+
+
+def parse_html(html: str):
+    """Parse a page with selectolax, or BeautifulSoup + lxml if it's unavailable."""
+    if LexborHTMLParser is not None:
+        return LexborHTMLParser(html)
+    return SoupTree(html)
+
+
+def strip_noise(tree):
+    """Remove navigation, scripts and ad/tracking containers from a parsed page."""
+    for element in tree.css(NOISE_SELECTOR):
+        element.decompose()
+
+
+def container_text(tree) -> str:
+    """Text of the first non-empty <article> or <main> element."""
+    for node in tree.css('article, main'):
+        text = node.text(separator=' ')
+        if text:
+            return text
+    return ""
+
+
+def find_article_text(tree) -> str:
+    """
+    Pick the article body from a cleaned page, falling back to all paragraphs.
+    
+    Every candidate is matched in one query, in document order: the first
+    non-empty <article>/<main> wins, then the first non-empty content div, then
+    the page's paragraphs joined.
+    """
+    content_divs = []
+    paragraphs = []
+    
+    for node in tree.css(ARTICLE_CANDIDATES_SELECTOR):
+        if node.tag == 'p':
+            paragraphs.append(node)
+        elif node.tag == 'div':
+            content_divs.append(node)
+        else:
+            text = node.text(separator=' ')
+            if text:
+                return text
+    
+    for node in content_divs:
+        text = node.text(separator=' ')
+        if text:
+            return text
+    
+    return '\n'.join(p.text(separator=' ') for p in paragraphs)
+
+
 def extract_article_text(url: str) -> Optional[str]:
     """Extracts article text from a URL with improved cleaning."""
     try:
-        parsed = urlparse(url)
-        if not parsed.scheme or not parsed.netloc:
+        if not _URL_RE.match(url):
             raise ValueError("Invalid URL format")
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Remove unwanted elements
-        for element in soup(["script", "style", "nav", "header", "footer", 
-                            "aside", "iframe", "noscript", "form", "button"]):
-            element.decompose()
-        
-        # Remove common ad/tracking containers
-        for div in soup.find_all(['div', 'section', 'span']):
-            try:
-                div_class = str(div.get('class', '')).lower() if div else ''
-                div_id = str(div.get('id', '')).lower() if div else ''
-                if any(keyword in div_class or keyword in div_id 
-                       for keyword in ['ad', 'advertisement', 'social', 'share', 
-                                      'comment', 'related', 'sidebar', 'menu',
-                                      'promo', 'newsletter', 'subscription', 'popup',
-                                      'trending', 'recommended', 'widget', 'banner']):
-                    div.decompose()
-            except (AttributeError, TypeError):
-                continue
-        
-        article_text = ""
-        
-        # Try to find main article content
-        for tag in soup.find_all(['article', 'main']):
-            article_text = tag.get_text()
-            if article_text:
-                break
-        
-        if not article_text:
-            for tag in soup.find_all('div'):
-                if tag.get('class') and any(
-                    cls in str(tag.get('class')).lower() 
-                    for cls in ['content', 'article', 'post', 'body', 'story']
-                ):
-                    article_text = tag.get_text()
-                    if article_text:
-                        break
-        
-        if not article_text:
-            paragraphs = soup.find_all('p')
-            article_text = '\n'.join([p.get_text() for p in paragraphs])
+        with _http.get(url, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            
+            # Only the headers have arrived so far; skip PDFs, images and feeds unread
+            content_type = response.headers.get('Content-Type', '')
+            if content_type and 'html' not in content_type.lower():
+                logger.info("Skipping %s with non-HTML content type %s", url, content_type)
+                return None
+            
+            html, complete = read_article_html(response)
+            encoding = html_encoding(response, html)
+            article_text = ""
+            
+            # Try the truncated page first; it ends right after the first article container
+            if not complete:
+                tree = parse_html(html.decode(encoding, errors='replace'))
+                strip_noise(tree)
+                article_text = container_text(tree)
+                
+                if not article_text:
+                    html += response.content
+            
+            if not article_text:
+                tree = parse_html(html.decode(encoding, errors='replace'))
+                strip_noise(tree)
+                article_text = find_article_text(tree)
         
         # Clean and normalize whitespace
         article_text = ' '.join(article_text.split())
@@ -159,94 +782,228 @@ def extract_article_text(url: str) -> Optional[str]:
         if not article_text or len(article_text) < 100:
             return None
         
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Extracted %d characters from %s", len(article_text), url)
+        
         return article_text
         
     except Exception as e:
-        logger.error(f"Error extracting article: {e}")
+        logger.error("Error extracting article from %s: %s", url, e)
         return None
 
 
-def chunk_text(text: str, max_tokens: int = 512) -> list:
-    """Chunks text into smaller segments for processing."""
-    chars_per_chunk = max_tokens * 4
-    words = text.split()
-    chunks = []
-    current_chunk = []
-    current_length = 0
+def special_token_affixes(tokenizer) -> Tuple[List[int], List[int]]:
+    """The special token ids the tokenizer puts before and after a single sequence, e.g. [CLS] and [SEP]."""
+    bare = tokenizer("a", add_special_tokens=False)["input_ids"]
+    wrapped = tokenizer("a", add_special_tokens=True)["input_ids"]
     
-    for word in words:
-        current_length += len(word) + 1
-        current_chunk.append(word)
-        
-        if current_length > chars_per_chunk:
-            chunks.append(' '.join(current_chunk))
-            current_chunk = []
-            current_length = 0
-    
-    if current_chunk:
-        chunks.append(' '.join(current_chunk))
+    for start in range(len(wrapped) - len(bare) + 1):
+        if wrapped[start:start + len(bare)] == bare:
+            return wrapped[:start], wrapped[start + len(bare):]
     
-    return chunks
+    return [], []
 
 
-def get_middle_chunk(chunks: list) -> str:
-    """Get the middle chunk from a list of chunks."""
-    if not chunks:
-        return ""
+def tokenized_chunks(token_ids: List[int], tokenizer, max_length: int = 512) -> List[List[int]]:
+    """
+    Split an article's token ids into consecutive model-ready windows.
+    
+    Each window holds as many tokens as fit in max_length alongside the
+    tokenizer's special tokens, so no chunk is truncated or padded by guesswork.
+    """
+    prefix, suffix = special_token_affixes(tokenizer)
+    window = max_length - len(prefix) - len(suffix)
     
-    middle_index = len(chunks) // 2
-    return chunks[middle_index]
+    return [
+        prefix + token_ids[start:start + window] + suffix
+        for start in range(0, len(token_ids), window)
+    ]
 
 
 def get_cache_key(text: str) -> str:
     """Generate cache key from text hash."""
-    import hashlib
-    return hashlib.md5(text.encode()).hexdigest()
+    return xxhash.xxh3_128_hexdigest(text.encode())
+
+
+def get_token_cache_key(token_ids: List[int]) -> str:
+    """Generate cache key from a hash of the article's token ids."""
+    return xxhash.xxh3_128_hexdigest(np.asarray(token_ids, dtype=np.int32).tobytes())
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL by lowercasing the host and dropping tracking parameters and the fragment."""
+    parts = urlsplit(url)
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACKING_PARAM_RE.match(key)
+    ]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(query), ''))
+
+
+def get_url_cache_key(url: str) -> str:
+    """Generate cache key for the result of analyzing a URL."""
+    return "url:" + get_cache_key(canonical_url(url))
 
 
 def check_cache(cache_key: str) -> Optional[Dict]:
     """Check if result exists in cache and is not expired."""
-    if cache_key in _cache:
-        result, timestamp = _cache[cache_key]
+    with _cache_lock:
+        entry = _cache.get(cache_key)
+        if entry is None:
+            return None
         
-        if datetime.now() - timestamp < timedelta(seconds=CACHE_TTL_SECONDS):
+        result, timestamp = entry
+        if time.monotonic() - timestamp < CACHE_TTL_SECONDS:
+            _cache.move_to_end(cache_key)
             return result
-        else:
-            del _cache[cache_key]
-    
-    return None
+        
+        del _cache[cache_key]
+        return None
 
 
 def store_cache(cache_key: str, result: Dict):
-    """Store result in cache with timestamp."""
-    _cache[cache_key] = (result, datetime.now())
+    """Store result in cache with timestamp, evicting the least recently used entry when full."""
+    with _cache_lock:
+        _cache[cache_key] = (result, time.monotonic())
+        _cache.move_to_end(cache_key)
+        if len(_cache) > CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
 
 
-def get_satire_score(text: str) -> float:
-    """Detects sarcasm/satire in text."""
-    if _satire_model is None or _satire_tokenizer is None:
-        return 0.0
+def batched_token_scores(model, tokenizer, sequences: List[List[int]]) -> List[float]:
+    """
+    Positive-class probability for each tokenized chunk, batched by sequence length.
     
-    inputs = _satire_tokenizer(
-        text,
-        return_tensors="pt",
-        truncation=True,
-        max_length=512,
-        padding=True
-    )
+    Chunks are sorted by token length and grouped into SEQUENCE_BUCKETS, with
+    forwards of up to MAX_BATCH_SIZE chunks per bucket padded only to that
+    bucket's longest chunk, so short chunks don't pay attention cost for a
+    long neighbour's padding.
+    Scores are returned in the original chunk order.
+    """
+    if not sequences:
+        return []
+    
+    lengths = np.fromiter((len(ids) for ids in sequences), dtype=np.int64, count=len(sequences))
+    order = np.argsort(lengths, kind="stable")
+    buckets = np.searchsorted(SEQUENCE_BUCKETS, lengths[order])
+    scores = np.empty(len(sequences), dtype=np.float32)
+    
+    for bucket in np.unique(buckets):
+        bucket_members = order[buckets == bucket]
+        for start in range(0, len(bucket_members), MAX_BATCH_SIZE):
+            members = bucket_members[start:start + MAX_BATCH_SIZE]
+            inputs = tokenizer.pad(
+                {"input_ids": [sequences[i] for i in members]},
+                padding="longest",
+                return_attention_mask=True,
+                return_tensors="pt"
+            )
+            
+            inputs = to_model_device(model, inputs)
+            
+            with torch.inference_mode():
+                logits = model_logits(model, inputs)
+            
+            # Softmax over two classes is a sigmoid of the logit difference, taken
+            # in float32 so half-precision models still give scores finer than
+            # bfloat16's ~0.004 steps near 0.5
+            logits = logits.float()
+            scores[members] = torch.sigmoid(logits[:, 1] - logits[:, 0]).cpu().numpy()
+    
+    return scores.tolist()
+
+
+def memoized_token_scores(model_name: str, batcher: MicroBatcher, chunks: List[List[int]]) -> "Future[List[float]]":
+    """
+    Score chunks through a model's micro-batcher, reusing remembered scores for chunks seen before.
+    
+    Syndicated copies of a story usually share their opening windows and differ
+    only in the site's trailing boilerplate, so only the differing chunks reach
+    the model. Returns without waiting, so callers can queue both models'
+    chunks before blocking on either.
+    """
+    keys = [(model_name, get_token_cache_key(chunk)) for chunk in chunks]
+    scores: List[Optional[float]] = [None] * len(chunks)
+    result: "Future[List[float]]" = Future()
+    
+    with _chunk_scores_lock:
+        for i, key in enumerate(keys):
+            score = _chunk_scores.get(key)
+            if score is not None:
+                _chunk_scores.move_to_end(key)
+                scores[i] = score
+    
+    missing = [i for i, score in enumerate(scores) if score is None]
+    if not missing:
+        result.set_result(scores)
+        return result
+    
+    def merge(computed_future):
+        try:
+            computed = computed_future.result()
+        except Exception as e:
+            result.set_exception(e)
+            return
+        
+        with _chunk_scores_lock:
+            for i, score in zip(missing, computed):
+                scores[i] = score
+                _chunk_scores[keys[i]] = score
+            while len(_chunk_scores) > CHUNK_SCORES_MAX_ENTRIES:
+                _chunk_scores.popitem(last=False)
+        result.set_result(scores)
     
-    inputs = {k: v.to(_device) for k, v in inputs.items()}
+    batcher.submit([chunks[i] for i in missing]).add_done_callback(merge)
+    return result
+
+
+def submit_satire_scores(chunks: List[List[int]]) -> "Future[List[float]]":
+    """Queues sarcasm/satire detection for a batch of tokenized chunks."""
+    if _satire_model is None or _satire_tokenizer is None:
+        future: "Future[List[float]]" = Future()
+        future.set_result([0.0] * len(chunks))
+        return future
     
-    with torch.no_grad():
-        outputs = _satire_model(**inputs)
+    return memoized_token_scores("satire", _satire_batcher, chunks)
+
+
+def submit_fake_news_scores(chunks: List[List[int]]) -> "Future[List[float]]":
+    """Queues fake news scoring for a batch of tokenized chunks."""
+    return memoized_token_scores("fake_news", _fake_news_batcher, chunks)
+
+
+def run_on_stream(stream, fn, *args):
+    """Call fn on the given CUDA stream, or directly when there is none (CPU)."""
+    if stream is None:
+        return fn(*args)
     
-    probabilities = torch.nn.functional.softmax(outputs.logits, dim=-1)
-    sarcasm_score = probabilities[0][1].item()
+    with torch.cuda.stream(stream):
+        return fn(*args)
+
+
+def get_satire_score(text: str) -> float:
+    """Detects sarcasm/satire in text, truncated to 512 tokens."""
+    initialize_model()
+    if _satire_model is None or _satire_tokenizer is None:
+        return 0.0
     
-    return sarcasm_score
+    token_ids = _satire_tokenizer(text, truncation=True, max_length=512)["input_ids"]
+    return submit_satire_scores([token_ids]).result()[0]
+
+
+def extraction_error_result() -> Dict[str, Any]:
+    """Result returned when an article URL can't be fetched or parsed."""
+    return {
+        'error': "Failed to fetch or extract article from URL",
+        'score': None,
+        'planet': None,
+        'label': None,
+        'confidence': None,
+        'source': "URL"
+    }
 
 
-def get_truthfulness_score(article_input: str) -> Dict[str, Any]:
+def get_truthfulness_score(article_input: str, mode: str = "full", use_cache: bool = True) -> Dict[str, Any]:
     """
     Analyzes an article and returns a truthfulness score (0.0-1.0) 
     and corresponding planet rating.
@@ -254,92 +1011,234 @@ def get_truthfulness_score(article_input: str) -> Dict[str, Any]:
     KEY FIX: Processes ALL chunks and averages scores to analyze entire article,
     not just first 512 tokens. This ensures consistent results regardless of
     website structure and HTML noise.
-    """
-    initialize_model()
     
+    With use_cache=False a URL is fetched again even if its result is cached.
+    """
     # Check if input is a URL or direct text
-    if article_input.startswith('http://') or article_input.startswith('https://'):
-        article_text = extract_article_text(article_input)
-        source = "URL"
+    if article_input.startswith(URL_PREFIXES):
+        url_key = get_url_cache_key(article_input)
+        cached_result = check_cache(url_key) if use_cache else None
+        if cached_result:
+            return cached_result
         
-        if article_text is None:
-            return {
-                'error': "Failed to fetch or extract article from URL",
-                'score': None,
-                'planet': None,
-                'label': None,
-                'confidence': None,
-                'source': "URL"
-            }
-    else:
-        article_text = article_input
-        source = "Text"
-    
-    # Check cache
-    cache_key = get_cache_key(article_text)
-    cached_result = check_cache(cache_key)
-    if cached_result:
-        return cached_result
-    
-    # FIXED: Chunk the text and process ALL chunks through fake news detection
-    fake_news_chunks = chunk_text(article_text, max_tokens=450)  # Leave room for special tokens
-    
-    # Process ALL chunks through fake news model and collect scores
-    fake_news_scores = []
-    for chunk in fake_news_chunks:
-        inputs = _tokenizer(
-            chunk, 
-            return_tensors="pt", 
-            truncation=True, 
-            max_length=512, 
-            padding=True
-        )
-        
-        inputs = {k: v.to(_device) for k, v in inputs.items()}
-        
-        with torch.no_grad():
-            outputs = _model(**inputs)
-        
-        probabilities = torch.nn.functional.softmax(outputs.logits, dim=-1)
-        real_probability = probabilities[0][0].item()
-        fake_news_scores.append(1.0 - real_probability)
+        article_text = extract_article_text(article_input)
+        return score_fetched_articles([article_text], [url_key], mode)[0]
     
-    # Average all chunk scores to get overall fake news score
-    final_fake_score = sum(fake_news_scores) / len(fake_news_scores) if fake_news_scores else 0.0
+    return score_article_text(article_input, source="Text", mode=mode)
+
+
+def get_truthfulness_scores(urls: List[str], max_workers: int = 8, mode: str = "full") -> List[Dict[str, Any]]:
+    """
+    Analyzes several article URLs, returning one result per URL in order.
     
-    # Check for sarcasm/satire across all chunks
-    satire_chunks = chunk_text(article_text, max_tokens=512)
-    satire_scores = []
-    for chunk in satire_chunks:
-        sarcasm_chunk_score = get_satire_score(chunk)
-        satire_scores.append(sarcasm_chunk_score)
+    Articles not already cached are fetched concurrently over the shared HTTP
+    session, so the network round-trips overlap instead of adding up, and are
+    then scored together in one batched pass.
+    """
+    url_keys = [get_url_cache_key(url) for url in urls]
+    results = [check_cache(url_key) for url_key in url_keys]
     
-    # Use maximum satire score (if any part is satirical, flag it)
-    sarcasm_score = max(satire_scores) if satire_scores else 0.0
+    # Fetch each uncached article once, even if it appears under several URLs
+    pending = {}
+    for i, result in enumerate(results):
+        if result is None:
+            pending.setdefault(url_keys[i], i)
     
-    # Combine scores: take the maximum of fake news and satire scores
-    final_score = max(final_fake_score, sarcasm_score)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        article_texts = list(executor.map(extract_article_text, [urls[i] for i in pending.values()]))
+    
+    fetched = dict(zip(pending, score_fetched_articles(article_texts, list(pending), mode)))
+    
+    return [fetched[url_key] if result is None else result for url_key, result in zip(url_keys, results)]
+
+
+def score_fetched_articles(article_texts: List[Optional[str]], url_keys: List[str], mode: str) -> List[Dict[str, Any]]:
+    """Score texts extracted from URLs together and remember each result under its URL's cache key."""
+    results = [extraction_error_result() if article_text is None else None for article_text in article_texts]
+    extracted = [i for i, article_text in enumerate(article_texts) if article_text is not None]
+    
+    scored = score_articles([article_texts[i] for i in extracted], source="URL", mode=mode)
+    for i, result in zip(extracted, scored):
+        results[i] = result
+        
+        # Fast-mode results are approximate; only full analyses answer later URL lookups
+        if mode == "full":
+            store_cache(url_keys[i], result)
     
-    # Map score to planet (0.0 = Sun, 1.0 = Neptune)
-    planet_index = min(int(final_score * len(PLANETS)), len(PLANETS) - 1)
-    planet = PLANETS[planet_index]
+    return results
+
+
+def score_to_planet(scores: np.ndarray) -> np.ndarray:
+    """Map an array of credibility scores to planets (0.0 = Sun, 1.0 = Neptune)."""
+    indices = (np.asarray(scores, dtype=np.float64) * len(_PLANETS_ARR)).astype(np.int64)
+    return _PLANETS_ARR[np.clip(indices, 0, len(_PLANETS_ARR) - 1)]
+
+
+def build_result(fake_news_score: float, sarcasm_score: float, source: str,
+                 chunks_processed: int, planet: str) -> Dict[str, Any]:
+    """Combine the two model scores and their planet into the result returned to callers."""
+    # Combine scores: take the maximum of fake news and satire scores
+    final_score = max(fake_news_score, sarcasm_score)
     
     # Determine label based on threshold
     predicted_label = "Fake" if final_score > 0.5 else "Real"
     
-    # Build result
-    result = {
+    return {
         'score': round(final_score, 4),
         'planet': planet,
         'label': predicted_label,
         'confidence': round(final_score, 4),
-        'fake_news_score': round(final_fake_score, 4),
+        'fake_news_score': round(fake_news_score, 4),
         'sarcasm_score': round(sarcasm_score, 4),
         'source': source,
-        'chunks_processed': len(fake_news_chunks)
+        'chunks_processed': chunks_processed
     }
+
+
+def build_results(fake_news_scores, sarcasm_scores, source: str, chunks_processed) -> List[Dict[str, Any]]:
+    """build_result for per-article score arrays, mapping every article to its planet in one lookup."""
+    fake_news_scores = np.asarray(fake_news_scores, dtype=np.float64)
+    sarcasm_scores = np.asarray(sarcasm_scores, dtype=np.float64)
+    planets = score_to_planet(np.maximum(fake_news_scores, sarcasm_scores))
     
-    # Store in cache
-    store_cache(cache_key, result)
+    return [
+        build_result(float(fake_news_score), float(sarcasm_score), source, int(chunks), planet)
+        for fake_news_score, sarcasm_score, chunks, planet in zip(
+            fake_news_scores, sarcasm_scores, chunks_processed, planets
+        )
+    ]
+
+
+def score_article_text(article_text: str, source: str = "Text", mode: str = "full") -> Dict[str, Any]:
+    """Scores already-extracted article text through both classifiers."""
+    return score_articles([article_text], source=source, mode=mode)[0]
+
+
+def reduce_chunk_scores(scores: List[float], chunks_per_article: List[list], ufunc) -> np.ndarray:
+    """
+    Reduce a flat list of chunk scores to one value per article with ufunc.reduceat.
+    
+    Scores must be laid out article by article, as chunks_per_article is;
+    articles without chunks get 0.0.
+    """
+    counts = np.fromiter((len(chunks) for chunks in chunks_per_article), dtype=np.int64, count=len(chunks_per_article))
+    reduced = np.zeros(len(counts), dtype=np.float64)
+    
+    has_chunks = counts > 0
+    if has_chunks.any():
+        starts = (np.cumsum(counts) - counts)[has_chunks]
+        reduced[has_chunks] = ufunc.reduceat(np.asarray(scores, dtype=np.float64), starts)
+    
+    return reduced
+
+
+def score_articles(article_texts: List[str], source: str = "Text", mode: str = "full") -> List[Dict[str, Any]]:
+    """
+    Scores several extracted articles through both classifiers, in order.
+    
+    The chunks of every article that reaches the transformers are pooled, so
+    each model runs one set of length-bucketed batches for all of them, and
+    the chunk scores are reduced back to one result per article.
+    
+    With mode="fast" the hashed linear model (see fast_model.py) is tried first
+    and its score is returned as-is when it is confident; borderline texts fall
+    through to the transformers. The fast path doesn't detect satire.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(article_texts)
+    pending = []
+    unmodeled = []
+    
+    for i, article_text in enumerate(article_texts):
+        # Too short to classify meaningfully; don't pay for a forward pass
+        if len(article_text) < MIN_TEXT_LENGTH:
+            unmodeled.append((i, 0.5))
+            continue
+        
+        if mode == "fast":
+            fast_score = fast_fake_news_score(article_text)
+            if fast_score is not None and abs(fast_score - 0.5) >= FAST_MODE_MARGIN:
+                unmodeled.append((i, fast_score))
+                continue
+        
+        pending.append(i)
+    
+    # Texts answered without the transformers have no satire score or chunks
+    if unmodeled:
+        zeros = np.zeros(len(unmodeled), dtype=np.int64)
+        for (i, _), result in zip(unmodeled, build_results([score for _, score in unmodeled], zeros, source, zeros)):
+            results[i] = result
+    
+    if not pending:
+        return results
+    
+    initialize_model()
     
-    return result
\ No newline at end of file
+    # Check cache, keyed on the token stream the model sees so that whitespace
+    # and casing variants of the same article share an entry
+    token_ids = _tokenizer([article_texts[i] for i in pending], add_special_tokens=False, verbose=False)["input_ids"]
+    uncached = []
+    for i, article_ids in zip(pending, token_ids):
+        cache_key = get_token_cache_key(article_ids)
+        cached_result = check_cache(cache_key)
+        if cached_result:
+            results[i] = cached_result
+        else:
+            uncached.append((i, cache_key, article_ids))
+    
+    if not uncached:
+        return results
+    
+    # FIXED: Chunk the text and process ALL chunks through fake news detection,
+    # reusing the token ids above instead of tokenizing each chunk again
+    fake_news_chunks = [tokenized_chunks(article_ids, _tokenizer) for _, _, article_ids in uncached]
+    
+    if _satire_tokenizer is _tokenizer:
+        satire_chunks = fake_news_chunks
+    elif _satire_tokenizer is not None:
+        satire_ids = _satire_tokenizer(
+            [article_texts[i] for i, _, _ in uncached], add_special_tokens=False, verbose=False
+        )["input_ids"]
+        satire_chunks = [tokenized_chunks(article_ids, _satire_tokenizer) for article_ids in satire_ids]
+    else:
+        satire_chunks = [[] for _ in uncached]
+    
+    # The two models are independent: queue these chunks on both models'
+    # batchers before waiting, so they run side by side
+    fake_news_future = submit_fake_news_scores([chunk for chunks in fake_news_chunks for chunk in chunks])
+    satire_future = submit_satire_scores([chunk for chunks in satire_chunks for chunk in chunks])
+    fake_news_scores = fake_news_future.result()
+    satire_scores = satire_future.result()
+    
+    # Average all chunk scores to get each article's fake news score
+    chunk_counts = np.fromiter((len(chunks) for chunks in fake_news_chunks), dtype=np.int64, count=len(uncached))
+    final_fake_scores = reduce_chunk_scores(fake_news_scores, fake_news_chunks, np.add) / np.maximum(chunk_counts, 1)
+    
+    # Use maximum satire score (if any part is satirical, flag it)
+    sarcasm_scores = reduce_chunk_scores(satire_scores, satire_chunks, np.maximum)
+    
+    for (i, cache_key, _), result in zip(
+        uncached, build_results(final_fake_scores, sarcasm_scores, source, chunk_counts)
+    ):
+        # Store in cache
+        store_cache(cache_key, result)
+        results[i] = result
+    
+    return results
+
+
+def _initialize_in_background():
+    """Warm the models at startup; requests retry the load if this fails."""
+    try:
+        initialize_model()
+    except Exception as e:
+        logger.error("Background model initialization failed: %s", e)
+
+
+def start_background_initialization():
+    """
+    Load and warm the models on a background thread so the first request doesn't pay for it.
+    
+    Called by the server at startup rather than on import, so scripts such as
+    export_onnx.py that only need the helpers don't load the models as well.
+    """
+    threading.Thread(target=_initialize_in_background, name="model-init", daemon=True).start()
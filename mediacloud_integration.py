@@ -1,9 +1,12 @@
 import os
 import logging
-from typing import Dict, List, Optional, Any
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from mediacloud.api import SearchApi
-from main import get_truthfulness_score
+from main import canonical_url, get_truthfulness_scores
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,9 +25,14 @@ PLANETS = [
     "☆ Neptune"
 ]
 
+# Concurrent article fetches per similar-articles search
+FETCH_WORKERS = 16
+
 # Cache for MediaCloud results
-_mediacloud_cache = {}
+_mediacloud_cache = OrderedDict()
+_mediacloud_cache_lock = threading.Lock()
 CACHE_TTL_SECONDS = 3600
+CACHE_MAX_ENTRIES = 1024
 
 
 class MediaCloudCollector:
@@ -55,11 +63,11 @@ class MediaCloudCollector:
             cache_key = f"{query}_{limit}"
             cached_result = self._check_cache(cache_key)
             if cached_result:
-                logger.info(f"Returning cached results for query: {query}")
+                logger.info("Returning cached results for query: %s", query)
                 return cached_result
             
             # Search MediaCloud for articles
-            logger.info(f"Searching MediaCloud for: {query}")
+            logger.info("Searching MediaCloud for: %s", query)
             
             # Use story_list to search for articles
             # MediaCloud expects specific date ranges, so we'll search recent articles
@@ -77,11 +85,13 @@ class MediaCloudCollector:
             if stories_list:
                 # Enhanced relevance scoring for better keyword matching
                 scored_articles = []
+                query_lower = query.lower()
+                query_words = tuple(word.strip() for word in query_lower.split() if len(word.strip()) > 2)
                 
                 for story in stories_list:
                     article_data = self.get_article_metadata(story)
                     if article_data:
-                        relevance_score = self._calculate_relevance_score(article_data, query)
+                        relevance_score = self._calculate_relevance_score(article_data, query_lower, query_words)
                         scored_articles.append((article_data, relevance_score))
                 
                 # Sort by relevance score (highest first) and extract articles
@@ -92,11 +102,11 @@ class MediaCloudCollector:
             # Cache the results
             self._store_cache(cache_key, articles)
             
-            logger.info(f"Found {len(articles)} articles for query: {query}")
+            logger.info("Found %d articles for query: %s", len(articles), query)
             return articles
             
         except Exception as e:
-            logger.error(f"Error searching MediaCloud: {e}")
+            logger.error("Error searching MediaCloud: %s", e)
             return []
     
     def get_article_metadata(self, article_data: Dict) -> Optional[Dict]:
@@ -125,118 +135,57 @@ class MediaCloudCollector:
             
             # Validate required fields
             if not metadata['title'] or not metadata['url']:
-                logger.warning(f"Skipping article with missing title or URL: {metadata}")
+                logger.warning("Skipping article with missing title or URL: %s", metadata)
                 return None
             
             return metadata
             
         except Exception as e:
-            logger.error(f"Error extracting article metadata: {e}")
+            logger.error("Error extracting article metadata: %s", e)
             return None
     
     def _check_cache(self, cache_key: str) -> Optional[List[Dict]]:
         """Check if MediaCloud results exist in cache and are not expired."""
-        if cache_key in _mediacloud_cache:
-            result, timestamp = _mediacloud_cache[cache_key]
+        with _mediacloud_cache_lock:
+            entry = _mediacloud_cache.get(cache_key)
+            if entry is None:
+                return None
             
-            if datetime.now() - timestamp < timedelta(seconds=CACHE_TTL_SECONDS):
+            result, timestamp = entry
+            if time.monotonic() - timestamp < CACHE_TTL_SECONDS:
+                _mediacloud_cache.move_to_end(cache_key)
                 return result
-            else:
-                del _mediacloud_cache[cache_key]
-        
-        return None
+            
+            del _mediacloud_cache[cache_key]
+            return None
     
     def _store_cache(self, cache_key: str, result: List[Dict]):
-        """Store MediaCloud results in cache with timestamp."""
-        _mediacloud_cache[cache_key] = (result, datetime.now())
-    
-    def _calculate_relevance_score(self, article_data: Dict, query: str) -> float:
-        """
-        Calculate relevance score based on keyword matching.
-        Balanced approach - not too strict but prioritizes relevant articles.
-        """
-        title = article_data.get('title', '').lower()
-        query_words = [word.lower().strip() for word in query.split() if len(word.strip()) > 2]
-        
-        if not query_words:
-            return 1.0  # Default score if no meaningful query words
-        
-        score = 1.0  # Base score for all articles
-        
-        # Check for keyword matches in title
-        title_matches = 0
-        for word in query_words:
-            if word in title:
-                title_matches += 1
-                score += 3.0  # Good bonus for each keyword match
-        
-        # Extra bonus for exact phrase matches
-        if len(query_words) > 1 and query.lower() in title:
-            score += 8.0  # Strong bonus for exact phrase
-        
-        # Bonus for multiple word matches (indicates topical relevance)
-        if title_matches > 1:
-            score += title_matches * 1.5
-        
-        # Check for related terms to expand relevance
-        related_terms = self._get_related_terms(query.lower())
-        for term in related_terms:
-            if term in title:
-                score += 1.0  # Small bonus for related terms
-        
-        # Small penalty for very long titles (usually less focused)
-        title_word_count = len(title.split())
-        if title_word_count > 20:
-            score -= 0.5
-        
-        # Small bonus for focused titles with matches
-        if 5 <= title_word_count <= 15 and title_matches > 0:
-            score += 1.0
-        
-        return score
-    
-    def _get_related_terms(self, query: str) -> List[str]:
-        """Get semantically related terms for better matching."""
-        # Simple related terms mapping for common topics
-        related_map = {
-            'climate change': ['global warming', 'greenhouse', 'carbon', 'emissions', 'temperature', 'weather', 'environment'],
-            'artificial intelligence': ['ai', 'machine learning', 'neural', 'algorithm', 'automation', 'robot'],
-            'covid': ['coronavirus', 'pandemic', 'vaccine', 'virus', 'outbreak', 'health'],
-            'election': ['voting', 'ballot', 'candidate', 'campaign', 'poll', 'democracy'],
-            'economy': ['economic', 'financial', 'market', 'gdp', 'inflation', 'recession', 'business'],
-            'technology': ['tech', 'digital', 'software', 'innovation', 'startup', 'computer'],
-            'health': ['medical', 'healthcare', 'disease', 'treatment', 'hospital', 'medicine'],
-            'energy': ['power', 'electricity', 'renewable', 'solar', 'wind', 'oil', 'gas', 'fuel']
-        }
-        
-        related_terms = []
-        for key, terms in related_map.items():
-            if key in query:
-                related_terms.extend(terms)
-        
-        return related_terms
+        """Store MediaCloud results in cache with timestamp, evicting the least recently used entry when full."""
+        with _mediacloud_cache_lock:
+            _mediacloud_cache[cache_key] = (result, time.monotonic())
+            _mediacloud_cache.move_to_end(cache_key)
+            if len(_mediacloud_cache) > CACHE_MAX_ENTRIES:
+                _mediacloud_cache.popitem(last=False)
     
-    def _calculate_relevance_score(self, article_data: Dict, query: str) -> float:
+    def _calculate_relevance_score(self, article_data: Dict, query_lower: str, query_words: Tuple[str, ...]) -> float:
         """
         Calculate relevance score based on keyword matching in title and content.
         Higher score = more relevant to the search query.
-        """
-        title = article_data.get('title', '').lower()
-        query_words = [word.lower().strip() for word in query.split() if len(word.strip()) > 2]
         
+        query_lower and query_words are computed once per search by the caller.
+        """
         if not query_words:
             return 0.0
         
+        title = article_data.get('title', '').lower()
         score = 0.0
         
         # Title matching (weighted heavily)
-        title_matches = 0
-        for word in query_words:
-            if word in title:
-                title_matches += 1
-                # Bonus for exact phrase matches
-                if len(query_words) > 1 and query.lower() in title:
-                    score += 10.0
+        title_matches = sum(1 for word in query_words if word in title)
+        
+        # Bonus for exact phrase matches, per matched word
+        if len(query_words) > 1 and query_lower in title:
+            score += title_matches * 10.0
         
         # Score based on percentage of query words found in title
         title_coverage = title_matches / len(query_words)
@@ -302,20 +251,33 @@ def analyze_articles_by_planet(query: str, articles_per_planet: int = 1) -> Dict
         results_by_planet = {planet: [] for planet in PLANETS}
         total_processed = 0
         
+        # Drop syndicated copies of the same story so they aren't fetched and scored twice
+        seen_urls = set()
+        unique_articles = []
+        for article in articles:
+            story_key = canonical_url(article['url'])
+            if story_key not in seen_urls:
+                seen_urls.add(story_key)
+                unique_articles.append(article)
+        articles = unique_articles
+        
+        # Fetch all candidate articles concurrently, then score them
+        logger.info("Analyzing %d articles for query: %s", len(articles), query)
+        credibility_results = get_truthfulness_scores(
+            [article['url'] for article in articles],
+            max_workers=FETCH_WORKERS
+        )
+        
         # Process articles until we have enough for each planet or run out
-        for i, article in enumerate(articles):
+        for article, credibility_result in zip(articles, credibility_results):
             try:
                 # Skip if we already have enough articles
                 if total_processed >= articles_per_planet * len(PLANETS):
                     break
-                    
-                # Get credibility score for the article
-                url = article['url']
-                logger.info(f"Analyzing article {i+1}/{len(articles)}: {article['title'][:50]}...")
-                credibility_result = get_truthfulness_score(url)
                 
+                url = article['url']
                 if 'error' in credibility_result:
-                    logger.warning(f"Failed to analyze article {url}: {credibility_result['error']}")
+                    logger.warning("Failed to analyze article %s: %s", url, credibility_result['error'])
                     continue
                 
                 # Combine article metadata with credibility scores
@@ -339,7 +301,7 @@ def analyze_articles_by_planet(query: str, articles_per_planet: int = 1) -> Dict
                     total_processed += 1
                 
             except Exception as e:
-                logger.error(f"Error processing article {article.get('url', 'unknown')}: {e}")
+                logger.error("Error processing article %s: %s", article.get('url', 'unknown'), e)
                 continue
         
         # Remove empty planet groups
@@ -358,7 +320,7 @@ def analyze_articles_by_planet(query: str, articles_per_planet: int = 1) -> Dict
         }
         
     except Exception as e:
-        logger.error(f"Error in analyze_articles_by_planet: {e}")
+        logger.error("Error in analyze_articles_by_planet: %s", e)
         return {
             'error': str(e),
             'query': query,
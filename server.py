@@ -1,186 +1,335 @@
-from flask import Flask, request, jsonify, send_from_directory
+from dotenv import load_dotenv
+
+# Load environment variables from .env file before importing main, fast_model
+# and mediacloud_integration, which read their settings at import time
+load_dotenv()
+
+from flask import Flask, Response, request, send_from_directory
 from flask_cors import CORS
-from main import get_truthfulness_score
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
+from main import URL_PREFIXES, canonical_url, get_truthfulness_score, start_background_initialization
 from mediacloud_integration import analyze_articles_by_planet
+import atexit
 import logging
+import logging.handlers
+import orjson
 import os
+import queue
+import re
 from datetime import datetime
-from dotenv import load_dotenv
+from typing import Annotated, ClassVar, Dict, Optional, Tuple, Type
+import xxhash
+from pydantic import BaseModel, Field, StringConstraints, ValidationError, field_validator
 
-# Load environment variables from .env file
-load_dotenv()
+try:
+    import redis
+except ImportError:  # redis is optional; main.py still caches results per process
+    redis = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Hand records to a background listener so request handlers never wait on stderr
+_log_queue = queue.Queue(-1)
+_root_logger = logging.getLogger()
+_log_listener = logging.handlers.QueueListener(_log_queue, *_root_logger.handlers, respect_handler_level=True)
+_root_logger.handlers = [logging.handlers.QueueHandler(_log_queue)]
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# Response cache shared by all workers, enabled by setting REDIS_URL
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv('CACHE_TTL_SECONDS', 3600))
+_redis = redis.Redis.from_url(os.environ['REDIS_URL']) if redis is not None and os.getenv('REDIS_URL') else None
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend
 
+# Load and warm the models while the server starts up
+start_background_initialization()
+
+# Behind Apache/lighttpd, let the web server send static files itself; nginx
+# deployments serve /static/ directly instead (see nginx.conf)
+app.config['USE_X_SENDFILE'] = os.getenv('USE_X_SENDFILE') == '1'
+
+# Bodies are a URL or query, except the extension's page-text fallback on /predict-url
+app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH', 1024 * 1024))
+
+# /health never changes, so probes get pre-serialized bytes
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "model_loaded": True,
+    "model_name": "bert-tiny-finetuned-fake-news-detection + english-sarcasm-detector"
+})
+
+def J(obj, status: int = 200) -> Response:
+    """JSON response serialized with orjson, which also handles NumPy and datetime values."""
+    return Response(
+        orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS),
+        status=status,
+        mimetype='application/json'
+    )
+
+def response_cache_key(prefix: str, url: str) -> str:
+    """Redis key for an endpoint's response to a URL, or to the raw text /predict-url also accepts."""
+    if url.startswith(URL_PREFIXES):
+        url = canonical_url(url)
+    return prefix + xxhash.xxh3_128_hexdigest(url.encode())
+
+def get_cached_response(cache_key: str) -> Optional[dict]:
+    """Look up a cached endpoint response; Redis being unavailable counts as a miss."""
+    if _redis is None:
+        return None
+    
+    try:
+        cached = _redis.get(cache_key)
+    except redis.RedisError as e:
+        logger.warning("Redis lookup failed: %s", e)
+        return None
+    
+    return orjson.loads(cached) if cached else None
+
+def store_cached_response(cache_key: str, response: dict):
+    """Cache an endpoint response for RESPONSE_CACHE_TTL_SECONDS."""
+    if _redis is None:
+        return
+    
+    try:
+        _redis.setex(cache_key, RESPONSE_CACHE_TTL_SECONDS, orjson.dumps(response))
+    except redis.RedisError as e:
+        logger.warning("Redis store failed: %s", e)
+
+def force_refresh() -> bool:
+    """Whether the client asked to bypass cached results with ?force_refresh=1."""
+    return request.args.get('force_refresh') == '1'
+
+# Upper bounds on request fields, checked before any fetch or MediaCloud query
+MAX_URL_LENGTH = 2048
+MAX_QUERY_LENGTH = 512
+_CONTROL_CHARS = re.compile(r'[\x00-\x1f\x7f]')
+
+class RequestBody(BaseModel):
+    """Base for POST bodies; error_messages maps a field (or "field.error_type") to the client-facing detail."""
+    error_messages: ClassVar[Dict[str, str]] = {"": "Request body is required"}
+
+class PredictUrlRequest(RequestBody):
+    url: str
+    
+    error_messages: ClassVar[Dict[str, str]] = {"": "URL is required", "url": "URL is required"}
+
+class SimilarArticlesRequest(RequestBody):
+    query: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=MAX_QUERY_LENGTH)]
+    articles_per_planet: Annotated[int, Field(ge=1, le=10)] = 1
+    
+    error_messages: ClassVar[Dict[str, str]] = {
+        "": "Request body is required",
+        "query": "Query parameter is required",
+        "query.string_too_long": f"Query must be at most {MAX_QUERY_LENGTH} characters",
+        "articles_per_planet": "articles_per_planet must be a valid integer",
+        "articles_per_planet.greater_than_equal": "articles_per_planet must be between 1 and 10",
+        "articles_per_planet.less_than_equal": "articles_per_planet must be between 1 and 10"
+    }
+
+class AnalyzeArticleRequest(RequestBody):
+    # A pattern rather than HttpUrl so the URL reaches the scorer exactly as sent
+    url: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=MAX_URL_LENGTH, pattern=r'^https?://')]
+    
+    error_messages: ClassVar[Dict[str, str]] = {
+        "": "Request body is required",
+        "url": "URL parameter is required",
+        "url.string_too_long": f"URL must be at most {MAX_URL_LENGTH} characters",
+        "url.string_pattern_mismatch": "URL must start with http:// or https://",
+        "url.value_error": "URL must not contain control characters"
+    }
+    
+    @field_validator('url')
+    @classmethod
+    def no_control_characters(cls, url: str) -> str:
+        # Rejected here rather than left for the article fetch to fail on
+        if _CONTROL_CHARS.search(url):
+            raise ValueError("URL contains control characters")
+        return url
+
+def validate_body(model: Type[RequestBody]) -> Tuple[Optional[RequestBody], Optional[Response]]:
+    """Parse and validate the raw request body in one pass; returns the model or a 400 response."""
+    body = request.get_data(cache=False)
+    if not body.strip():
+        return None, J({"error": "ValidationError", "detail": model.error_messages[""]}, status=400)
+    
+    try:
+        return model.model_validate_json(body), None
+    except ValidationError as e:
+        error = e.errors()[0]
+        field = str(error['loc'][0]) if error['loc'] else ""
+        detail = (model.error_messages.get(f"{field}.{error['type']}")
+                  or model.error_messages.get(field)
+                  or error['msg'])
+        return None, J({"error": "ValidationError", "detail": detail}, status=400)
+
+@app.errorhandler(RequestEntityTooLarge)
+def handle_body_too_large(e):
+    """Reject bodies over MAX_CONTENT_LENGTH before they are read."""
+    return J({"error": "ValidationError", "detail": f"Request body exceeds {app.config['MAX_CONTENT_LENGTH']} bytes"}, status=413)
+
+@app.errorhandler(Exception)
+def handle_unexpected_error(e):
+    """Turn anything a handler didn't catch into a JSON 500; HTTP errors like 404/405 pass through."""
+    if isinstance(e, HTTPException):
+        return e
+    
+    logger.error("Error handling %s %s: %s", request.method, request.path, e)
+    return J({"error": "InternalServerError", "detail": str(e)}, status=500)
+
 @app.route('/')
 def serve_frontend():
-    """Serve the main HTML page."""
+    """Serve the main HTML page (development; nginx serves it in production)."""
     return send_from_directory('static', 'index.html')
 
 @app.route('/static/<path:filename>')
 def serve_static(filename):
-    """Serve static files."""
+    """Serve static files (development; nginx serves them in production)."""
     return send_from_directory('static', filename)
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Simple health check."""
-    return jsonify({
-        "status": "healthy",
-        "model_loaded": True,
-        "model_name": "bert-tiny-finetuned-fake-news-detection + english-sarcasm-detector"
-    })
+    return Response(_HEALTH_BODY, mimetype='application/json')
 
 @app.route('/predict-url', methods=['POST'])
 def predict_url():
     """Analyze news article from URL using your main.py function."""
-    try:
-        data = request.get_json()
-        if not data or 'url' not in data:
-            return jsonify({"error": "ValidationError", "detail": "URL is required"}), 400
-        
-        url = data['url']
-        # Call your main.py function directly
-        result = get_truthfulness_score(url)
-        
-        # Check for errors
-        if 'error' in result:
-            return jsonify({"error": "AnalysisError", "detail": result['error']}), 400
-        
-        # Convert to frontend format
-        if result['label'] == 'Fake':
-            frontend_label = "FAKE"
-            frontend_score = result['score']
-        else:
-            frontend_label = "REAL"
-            frontend_score = 1.0 - result['score']
-        
-        response = {
-            "label": frontend_label,
-            "score": round(frontend_score, 4),
-            "extracted_text": f"Article analyzed with {result.get('chunks_processed', 1)} text chunks processed.",
-            "planet": result.get('planet', '☀️ Sun'),
-            "fake_news_score": round(result.get('fake_news_score', 0), 4),
-            "sarcasm_score": round(result.get('sarcasm_score', 0), 4)
-        }
-        
-        return jsonify(response)
-        
-    except Exception as e:
-        return jsonify({"error": "InternalServerError", "detail": str(e)}), 500
+    req, error = validate_body(PredictUrlRequest)
+    if error:
+        return error
+    
+    url = req.url
+    cache_key = response_cache_key("pred:", url)
+    refresh = force_refresh()
+    
+    if not refresh:
+        cached = get_cached_response(cache_key)
+        if cached:
+            cached["cache_hit"] = True
+            return J(cached)
+    
+    # Call your main.py function directly
+    result = get_truthfulness_score(url, use_cache=not refresh)
+    
+    # Check for errors
+    if 'error' in result:
+        return J({"error": "AnalysisError", "detail": result['error']}, status=400)
+    
+    # Convert to frontend format
+    if result['label'] == 'Fake':
+        frontend_label = "FAKE"
+        frontend_score = result['score']
+    else:
+        frontend_label = "REAL"
+        frontend_score = 1.0 - result['score']
+    
+    response = {
+        "label": frontend_label,
+        "score": round(frontend_score, 4),
+        "extracted_text": f"Article analyzed with {result.get('chunks_processed', 1)} text chunks processed.",
+        "planet": result.get('planet', '☀️ Sun'),
+        "fake_news_score": round(result.get('fake_news_score', 0), 4),
+        "sarcasm_score": round(result.get('sarcasm_score', 0), 4)
+    }
+    
+    store_cached_response(cache_key, response)
+    response["cache_hit"] = False
+    return J(response)
 
 @app.route('/api/similar-articles', methods=['POST'])
 def search_similar_articles():
     """Search for similar articles using MediaCloud and analyze their credibility."""
-    try:
-        data = request.get_json(force=True, silent=True)
-        if data is None:
-            return jsonify({"error": "ValidationError", "detail": "Request body is required"}), 400
-        
-        # Validate required parameters
-        query = data.get('query', '').strip()
-        if not query:
-            return jsonify({"error": "ValidationError", "detail": "Query parameter is required"}), 400
-        
-        # Validate optional parameters
-        articles_per_planet = data.get('articles_per_planet', 1)
-        try:
-            articles_per_planet = int(articles_per_planet)
-            if articles_per_planet < 1 or articles_per_planet > 10:
-                return jsonify({"error": "ValidationError", "detail": "articles_per_planet must be between 1 and 10"}), 400
-        except (ValueError, TypeError):
-            return jsonify({"error": "ValidationError", "detail": "articles_per_planet must be a valid integer"}), 400
-        
-        logger.info(f"Searching for similar articles with query: {query}, articles_per_planet: {articles_per_planet}")
-        
-        # Call MediaCloud integration function
-        result = analyze_articles_by_planet(query, articles_per_planet)
-        
-        # Check for errors in the result
-        if 'error' in result:
-            error_detail = result['error']
-            if 'MediaCloud API key not configured' in error_detail:
-                return jsonify({"error": "ConfigurationError", "detail": "MediaCloud API key is not configured"}), 503
-            else:
-                return jsonify({"error": "MediaCloudError", "detail": error_detail}), 500
-        
-        # Format response for frontend
-        response = {
-            "query": result['query'],
-            "results_by_planet": result['results_by_planet'],
-            "total_articles": result['total_articles'],
-            "articles_per_planet_limit": result['articles_per_planet_limit'],
-            "search_timestamp": result['search_timestamp'],
-            "cache_hit": result.get('cache_hit', False)
-        }
-        
-        # Add message if no articles found
-        if result['total_articles'] == 0:
-            response["message"] = result.get('message', 'No articles found for the given query')
-        
-        logger.info(f"Found {result['total_articles']} articles for query: {query}")
-        return jsonify(response)
-        
-    except Exception as e:
-        logger.error(f"Error in similar articles search: {e}")
-        return jsonify({"error": "InternalServerError", "detail": str(e)}), 500
+    req, error = validate_body(SimilarArticlesRequest)
+    if error:
+        return error
+    
+    query, articles_per_planet = req.query, req.articles_per_planet
+    
+    logger.info("Searching for similar articles with query: %s, articles_per_planet: %d", query, articles_per_planet)
+    
+    # Call MediaCloud integration function
+    result = analyze_articles_by_planet(query, articles_per_planet)
+    
+    # Check for errors in the result
+    if 'error' in result:
+        error_detail = result['error']
+        if 'MediaCloud API key not configured' in error_detail:
+            return J({"error": "ConfigurationError", "detail": "MediaCloud API key is not configured"}, status=503)
+        else:
+            return J({"error": "MediaCloudError", "detail": error_detail}, status=500)
+    
+    # Format response for frontend
+    response = {
+        "query": result['query'],
+        "results_by_planet": result['results_by_planet'],
+        "total_articles": result['total_articles'],
+        "articles_per_planet_limit": result['articles_per_planet_limit'],
+        "search_timestamp": result['search_timestamp'],
+        "cache_hit": result.get('cache_hit', False)
+    }
+    
+    # Add message if no articles found
+    if result['total_articles'] == 0:
+        response["message"] = result.get('message', 'No articles found for the given query')
+    
+    logger.info("Found %d articles for query: %s", result['total_articles'], query)
+    return J(response)
 
 @app.route('/api/analyze-article', methods=['POST'])
 def analyze_single_article():
     """Analyze a single article for detailed credibility comparison."""
-    try:
-        data = request.get_json(force=True, silent=True)
-        if data is None:
-            return jsonify({"error": "ValidationError", "detail": "Request body is required"}), 400
-        
-        # Validate required parameters
-        url = data.get('url', '').strip()
-        if not url:
-            return jsonify({"error": "ValidationError", "detail": "URL parameter is required"}), 400
-        
-        # Validate URL format
-        if not (url.startswith('http://') or url.startswith('https://')):
-            return jsonify({"error": "ValidationError", "detail": "URL must start with http:// or https://"}), 400
-        
-        logger.info(f"Analyzing single article: {url}")
-        
-        # Call existing truthfulness analysis function
-        result = get_truthfulness_score(url)
-        
-        # Check for errors
-        if 'error' in result:
-            return jsonify({"error": "AnalysisError", "detail": result['error']}), 400
-        
-        # Format detailed response for credibility comparison
-        response = {
-            "url": url,
-            "credibility_score": result['score'],
-            "fake_news_score": result['fake_news_score'],
-            "sarcasm_score": result['sarcasm_score'],
-            "planet": result['planet'],
-            "label": result['label'],
-            "confidence": result['confidence'],
-            "chunks_processed": result.get('chunks_processed', 1),
-            "analysis_timestamp": datetime.now().isoformat(),
-            "detailed_scores": {
-                "fake_news_probability": result['fake_news_score'],
-                "sarcasm_probability": result['sarcasm_score'],
-                "overall_credibility": result['score'],
-                "credibility_rating": result['planet']
-            }
+    req, error = validate_body(AnalyzeArticleRequest)
+    if error:
+        return error
+    
+    url = req.url
+    
+    cache_key = response_cache_key("ana:", url)
+    refresh = force_refresh()
+    
+    if not refresh:
+        cached = get_cached_response(cache_key)
+        if cached:
+            cached["cache_hit"] = True
+            return J(cached)
+    
+    logger.info("Analyzing single article: %s", url)
+    
+    # Call existing truthfulness analysis function
+    result = get_truthfulness_score(url, use_cache=not refresh)
+    
+    # Check for errors
+    if 'error' in result:
+        return J({"error": "AnalysisError", "detail": result['error']}, status=400)
+    
+    # Format detailed response for credibility comparison
+    response = {
+        "url": url,
+        "credibility_score": result['score'],
+        "fake_news_score": result['fake_news_score'],
+        "sarcasm_score": result['sarcasm_score'],
+        "planet": result['planet'],
+        "label": result['label'],
+        "confidence": result['confidence'],
+        "chunks_processed": result.get('chunks_processed', 1),
+        "analysis_timestamp": datetime.now().isoformat(),
+        "detailed_scores": {
+            "fake_news_probability": result['fake_news_score'],
+            "sarcasm_probability": result['sarcasm_score'],
+            "overall_credibility": result['score'],
+            "credibility_rating": result['planet']
         }
-        
-        logger.info(f"Article analysis complete for {url}: {result['planet']} ({result['score']:.3f})")
-        return jsonify(response)
-        
-    except Exception as e:
-        logger.error(f"Error in single article analysis: {e}")
-        return jsonify({"error": "InternalServerError", "detail": str(e)}), 500
+    }
+    
+    logger.info("Article analysis complete for %s: %s (%.3f)", url, result['planet'], result['score'])
+    store_cached_response(cache_key, response)
+    response["cache_hit"] = False
+    return J(response)
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8001, debug=True)
\ No newline at end of file
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py)
+    app.run(host='0.0.0.0', port=8001, debug=os.getenv('FLASK_DEBUG') == '1')
\ No newline at end of file
@@ -0,0 +1,66 @@
+"""
+Train the linear model used by get_truthfulness_score(..., mode="fast").
+
+Usage:
+    python train_fast_model.py labeled_articles.csv [output.npz]
+
+The CSV needs a `text` column and a `label` column (1 = fake, 0 = real).
+Requires scikit-learn and scipy, which are only needed offline.
+"""
+import csv
+import sys
+import logging
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.linear_model import SGDClassifier
+
+from fast_model import FAST_MODEL_PATH, N_FEATURES, hash_features
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def load_dataset(path: str):
+    """Hash every row of the CSV into a sparse feature matrix and label vector."""
+    indptr, indices, values, labels = [0], [], [], []
+    
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            row_indices, row_values = hash_features(row['text'])
+            indices.append(row_indices)
+            values.append(row_values)
+            indptr.append(indptr[-1] + len(row_indices))
+            labels.append(int(row['label']))
+    
+    features = csr_matrix(
+        (np.concatenate(values), np.concatenate(indices), np.array(indptr)),
+        shape=(len(labels), N_FEATURES)
+    )
+    return features, np.array(labels)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    
+    output_path = sys.argv[2] if len(sys.argv) > 2 else FAST_MODEL_PATH
+    
+    features, labels = load_dataset(sys.argv[1])
+    logger.info("Training on %d articles", features.shape[0])
+    
+    classifier = SGDClassifier(loss='log_loss', alpha=1e-6, max_iter=20, tol=None)
+    classifier.fit(features, labels)
+    logger.info("Training accuracy: %.4f", classifier.score(features, labels))
+    
+    np.savez_compressed(
+        output_path,
+        coef=classifier.coef_.astype(np.float32).ravel(),
+        intercept=np.float32(classifier.intercept_[0])
+    )
+    logger.info("Saved fast model to %s", output_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,17 @@
+"""
+Production entrypoint: gunicorn -c gunicorn.conf.py
+
+gevent must patch the standard library before requests, urllib3 or the
+server module are imported, so that article fetches and MediaCloud calls
+yield to other requests while they wait on the network. Patching also turns
+threads into greenlets, so model loading and forwards are handed to gevent's
+native thread pool (inference_server.run_blocking) to keep the event loop
+responsive while they run.
+"""
+from gevent import monkey
+
+# Not aggressive: keep select.epoll, which httpcore's optional trio backend
+# needs when huggingface_hub imports it (see gevent_worker.py)
+monkey.patch_all(aggressive=False)
+
+from server import app  # noqa: E402